@@ -0,0 +1,104 @@
+"""
+Ingest throughput benchmark for GroupCommitStore (the ExternalAPITool write path).
+
+For each size it compares:
+  per-record  one submit() per record, one commit each (the old one-call-per-record flow)
+  concurrent  per-record submits from several threads, coalesced by group commit
+  bulk        one submit() with every record (what /api/external-demo/bulk does)
+
+A listener maintains an email index, standing in for the dependent caches; it runs once
+per commit, off the write path. --commit-latency adds a fixed cost to every append to the
+backing store (a durable write, default 1ms), which is the cost group commit amortises.
+With --commit-latency 0 the per-record mode wins for a single thread: there is nothing
+to amortise, and concurrent writers only add thread handoffs.
+Sizes above --max-per-record (default 10000) only run the bulk mode.
+
+Usage: python bench_bulk_ingest.py [--sizes 1,10,100,1000,10000,100000] [--threads 8]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from group_commit import GroupCommitStore
+
+
+def make_records(n):
+    return [
+        ("clients", {"name": f"Client {i}", "email": f"client{i}@example.com", "status": "active", "idempotencyKey": f"bench-{i}"})
+        for i in range(n)
+    ]
+
+
+class SlowLog(list):
+    """Backing collection whose append pays a fixed latency, like a durable write."""
+
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+
+    def extend(self, records):
+        if self.latency:
+            time.sleep(self.latency)
+        super().extend(records)
+
+
+def new_store(window, commit_latency):
+    store = GroupCommitStore({"clients": SlowLog(commit_latency)}, window=window)
+    email_index = {}
+    stats = {"listener_calls": 0}
+
+    def index_emails(records):
+        stats["listener_calls"] += 1
+        email_index.update((r["email"], r["id"]) for r in records)
+
+    store.add_listener("clients", index_emails)
+    return store, stats
+
+
+def per_record(records, args):
+    store, stats = new_store(0, args.commit_latency)
+    for item in records:
+        store.submit([item])
+    return store, stats
+
+
+def concurrent(records, args):
+    store, stats = new_store(args.window, args.commit_latency)
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(lambda item: store.submit([item]), records))
+    return store, stats
+
+
+def bulk(records, args):
+    store, stats = new_store(args.window, args.commit_latency)
+    store.submit(records)
+    return store, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1,10,100,1000,10000,100000")
+    parser.add_argument("--threads", type=int, default=8, help="writer threads for the concurrent mode")
+    parser.add_argument("--window", type=float, default=0.0, help="group commit window in seconds (0 = no wait)")
+    parser.add_argument("--commit-latency", type=float, default=0.001, help="simulated seconds per backing-store append")
+    parser.add_argument("--max-per-record", type=int, default=10000, help="skip the one-record-per-submit modes above this size")
+    args = parser.parse_args()
+
+    print(f"{'records':>8} {'mode':<11} {'seconds':>9} {'records/s':>11} {'commits':>8} {'listener':>9}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        records = make_records(n)
+        for mode, fn in (("per-record", per_record), ("concurrent", concurrent), ("bulk", bulk)):
+            if mode != "bulk" and n > args.max_per_record:
+                continue
+            start = time.perf_counter()
+            store, stats = fn(records, args)
+            elapsed = time.perf_counter() - start
+            store.flush()
+            assert len(store.collections["clients"]) == n
+            # Replaying the same keys must not write anything
+            assert all(not created for _, created in store.submit(records[:10]))
+            print(f"{n:>8} {mode:<11} {elapsed:>9.3f} {n / elapsed:>11.0f} {store.commits:>8} {stats['listener_calls']:>9}")
+
+
+if __name__ == "__main__":
+    main()
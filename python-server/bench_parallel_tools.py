@@ -0,0 +1,164 @@
+"""
+Scripted fake-LLM benchmark for ParallelToolAgent.
+
+Compares the one-tool-call-per-step ReAct flow (what ZERO_SHOT_REACT_DESCRIPTION does)
+against batching independent tool calls into a single step, on multi-fact questions.
+Reports LLM round trips and wall time. No API key or model download is needed.
+
+Before timing, it checks parse_actions on mixed Thought/Action output and that tool calls
+keep the listed order around writes.
+
+Usage: python bench_parallel_tools.py [--llm-latency 0.3] [--tool-latency 0.1]
+"""
+import argparse
+import json
+import time
+
+from parallel_agent import ParallelToolAgent, parse_actions
+
+QUESTIONS = {
+    "Compare revenue and attendance for Pilates": [
+        ("MongoDBTool", '{"queryType": "revenue"}'),
+        ("MongoDBTool", '{"queryType": "attendanceReports"}'),
+        ("RAGTool", "Pilates"),
+    ],
+    "How are active vs inactive clients and outstanding payments looking?": [
+        ("MongoDBTool", '{"queryType": "activeClients"}'),
+        ("MongoDBTool", '{"queryType": "inactiveClients"}'),
+        ("MongoDBTool", '{"queryType": "outstandingPayments"}'),
+    ],
+    "Summarise top services, completion rates, drop-off rates and the Python course": [
+        ("MongoDBTool", '{"queryType": "topServices"}'),
+        ("MongoDBTool", '{"queryType": "courseCompletionRates"}'),
+        ("MongoDBTool", '{"queryType": "dropOffRates"}'),
+        ("RAGTool", "Python for Data Science"),
+    ],
+}
+
+
+class FakeMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class ScriptedLLM:
+    """Returns pre-written responses in order and counts round trips."""
+
+    def __init__(self, responses, latency):
+        self.responses = list(responses)
+        self.latency = latency
+        self.calls = 0
+
+    def invoke(self, prompt, stop=None):
+        time.sleep(self.latency)
+        self.calls += 1
+        return FakeMessage(self.responses.pop(0))
+
+
+class FakeTool:
+    def __init__(self, name, latency):
+        self.name = name
+        self.description = f"Fake {name} with {latency * 1000:.0f}ms latency."
+        self.latency = latency
+
+    def run(self, tool_input):
+        time.sleep(self.latency)
+        return json.dumps({"success": True, "result": f"{self.name}:{tool_input}"})
+
+
+def _action(name, tool_input):
+    return f"Action: {name}\nAction Input: {tool_input}\n"
+
+
+def sequential_script(calls):
+    steps = [f" I need {name} next.\n" + _action(name, tool_input) for name, tool_input in calls]
+    return steps + [" I now know the final answer\nFinal Answer: done"]
+
+
+def parallel_script(calls):
+    step = " These lookups are independent, run them together.\n" + "".join(_action(n, i) for n, i in calls)
+    return [step, " I now know the final answer\nFinal Answer: done"]
+
+
+PARSER_CASES = [
+    (
+        ' I need revenue first.\nAction: MongoDBTool\nAction Input: {"queryType": "revenue"}\n'
+        "Thought: I also need attendance\nAction: MongoDBTool\nAction Input: {\"queryType\": \"attendanceReports\"}",
+        [("MongoDBTool", '{"queryType": "revenue"}'), ("MongoDBTool", '{"queryType": "attendanceReports"}')],
+    ),
+    (
+        "Action: RAGTool\nAction Input: \"Pilates\"\n  Thought: and revenue\n\nAction: MongoDBTool\nAction Input: {\"queryType\":\n \"revenue\"}\n",
+        [("RAGTool", "Pilates"), ("MongoDBTool", '{"queryType":\n \"revenue\"}')],
+    ),
+    (
+        "Action: MongoDBTool\nAction Input: {\"queryType\": \"revenue\"}\nThought: that is all I need for now",
+        [("MongoDBTool", '{"queryType": "revenue"}')],
+    ),
+]
+
+
+def check_parser():
+    for text, expected in PARSER_CASES:
+        actions, final_answer = parse_actions(text)
+        assert actions == expected and final_answer is None, (text, actions)
+        for name, tool_input in actions:
+            if name == "MongoDBTool":
+                json.loads(tool_input)
+    assert parse_actions(" I now know the final answer\nFinal Answer: 42") == ([], "42")
+    assert parse_actions("no format at all") == ([], None)
+
+
+class LoggingTool(FakeTool):
+    def __init__(self, name, log):
+        super().__init__(name, 0)
+        self.log = log
+
+    def run(self, tool_input):
+        self.log.append(self.name)
+        return super().run(tool_input)
+
+
+def check_order():
+    log = []
+    tools = [LoggingTool(name, log) for name in ("MongoDBTool", "RAGTool", "ExternalAPITool")]
+    agent = ParallelToolAgent(None, tools)
+    agent._execute([("ExternalAPITool", "{}"), ("MongoDBTool", "{}"), ("RAGTool", "q"), ("ExternalAPITool", "{}"), ("MongoDBTool", "{}")])
+    assert log[0] == "ExternalAPITool" and sorted(log[1:3]) == ["MongoDBTool", "RAGTool"], log
+    assert log[3:] == ["ExternalAPITool", "MongoDBTool"], log
+
+
+def run_case(script, llm_latency, tool_latency, max_workers):
+    llm = ScriptedLLM(script, llm_latency)
+    tools = [FakeTool("MongoDBTool", tool_latency), FakeTool("RAGTool", tool_latency)]
+    agent = ParallelToolAgent(llm, tools, max_workers=max_workers)
+    start = time.perf_counter()
+    answer = agent.run({"input": "benchmark"})
+    assert answer == "done", answer
+    return llm.calls, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="seconds per fake LLM call")
+    parser.add_argument("--tool-latency", type=float, default=0.1, help="seconds per fake tool call")
+    args = parser.parse_args()
+    check_parser()
+    check_order()
+
+    print(f"{'question':<70} {'mode':<10} {'LLM calls':>9} {'wall (s)':>9}")
+    totals = {"sequential": [0, 0.0], "parallel": [0, 0.0]}
+    for question, calls in QUESTIONS.items():
+        for mode, script, workers in (
+            ("sequential", sequential_script(calls), 1),
+            ("parallel", parallel_script(calls), 4),
+        ):
+            llm_calls, wall = run_case(script, args.llm_latency, args.tool_latency, workers)
+            totals[mode][0] += llm_calls
+            totals[mode][1] += wall
+            print(f"{question[:70]:<70} {mode:<10} {llm_calls:>9} {wall:>9.3f}")
+    for mode, (llm_calls, wall) in totals.items():
+        print(f"{'TOTAL':<70} {mode:<10} {llm_calls:>9} {wall:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
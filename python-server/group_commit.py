@@ -0,0 +1,201 @@
+import hashlib
+import json
+import logging
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from typing import Callable, Dict, List, Tuple
+
+IDEMPOTENCY_FIELD = "idempotencyKey"
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyConflict(ValueError):
+    """An idempotency key was reused with a different payload."""
+
+
+def _fingerprint(data: dict) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class _Ticket:
+    def __init__(self, items):
+        self.items = items
+        self.results = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class GroupCommitStore:
+    """
+    Append-only writer for the in-memory collections used by ExternalAPITool.
+
+    Concurrent submit() calls are grouped into one commit: a single extend() per
+    collection and one update of the id/idempotency indexes. Writers that arrive while
+    a commit is running are picked up together by the next one, so a lone writer never
+    waits. An optional `window` (off by default) makes the leader sleep before
+    committing once commits start grouping several writers; it only pays off when each
+    commit is expensive compared to the wait.
+
+    Listeners get every new record of a commit in one call, on a background thread,
+    so cache maintenance never holds up writers. They run in commit order.
+
+    Each item may carry an 'idempotencyKey'. Replaying a key (per collection) with the
+    same payload returns the record created the first time; a different payload raises
+    IdempotencyConflict. Only the newest `max_keys` keys are remembered; older ones are
+    evicted. IDs are random UUIDs, so identical payloads without a key get distinct records.
+
+    Records and the id index live in memory for the life of the process.
+    """
+
+    def __init__(self, collections: Dict[str, list], window: float = 0.0, id_prefix: str = "mock_", max_keys: int = 100000):
+        self.collections = collections
+        self.window = window
+        self.id_prefix = id_prefix
+        self.max_keys = max_keys
+        self.by_id: Dict[str, dict] = {r["id"]: r for records in collections.values() for r in records if "id" in r}
+        # (collection, key) -> (record, payload fingerprint)
+        self.by_key: "OrderedDict[Tuple[str, str], Tuple[dict, str]]" = OrderedDict()
+        self.listeners: Dict[str, List[Callable[[List[dict]], None]]] = defaultdict(list)
+        self.commits = 0
+        self._last_batch_size = 1
+        self._pending: List[_Ticket] = []
+        self._leader_active = False
+        self._lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._listener_queue: "queue.Queue[Dict[str, List[dict]]]" = queue.Queue()
+        self._listener_thread = None
+
+    def add_listener(self, collection: str, callback: Callable[[List[dict]], None]):
+        """Register callback(new_records), called once per commit that adds records to collection."""
+        self.listeners[collection].append(callback)
+
+    def flush(self):
+        """Block until listeners have seen every commit so far."""
+        self._listener_queue.join()
+
+    def _notify(self, new_records: Dict[str, List[dict]]):
+        if self._listener_thread is None:
+            self._listener_thread = threading.Thread(target=self._run_listeners, name="group-commit-listeners", daemon=True)
+            self._listener_thread.start()
+        self._listener_queue.put(new_records)
+
+    def _run_listeners(self):
+        while True:
+            new_records = self._listener_queue.get()
+            try:
+                for collection, records in new_records.items():
+                    for callback in self.listeners[collection]:
+                        # Records are already committed; a failing cache update must not fail the write
+                        try:
+                            callback(records)
+                        except Exception:
+                            logger.exception("Listener %r for '%s' failed on %d records", callback, collection, len(records))
+            finally:
+                self._listener_queue.task_done()
+
+    def submit(self, items: List[Tuple[str, dict]]) -> List[Tuple[dict, bool]]:
+        """
+        Write (collection, data) items and block until they are committed.
+        Returns (record, created) per item, in order; created is False for idempotent replays.
+        """
+        # Validate and split out the key here, so bad input only fails this caller
+        normalized = []
+        for collection, data in items:
+            if collection not in self.collections:
+                raise ValueError(f"Unknown collection '{collection}'")
+            if not isinstance(data, dict):
+                raise ValueError("Each record must be a dictionary")
+            data = dict(data)
+            key = data.pop(IDEMPOTENCY_FIELD, None)
+            if isinstance(key, (int, float)) and not isinstance(key, bool):
+                key = str(key)
+            if key is not None and not isinstance(key, str):
+                raise ValueError(f"'{IDEMPOTENCY_FIELD}' must be a string")
+            normalized.append((collection, data, key, _fingerprint(data) if key is not None else None))
+        ticket = _Ticket(normalized)
+        with self._lock:
+            self._pending.append(ticket)
+            leader = not self._leader_active
+            self._leader_active = True
+        if leader:
+            self._lead()
+        ticket.done.wait()
+        if ticket.error:
+            raise ticket.error
+        return ticket.results
+
+    def _lead(self):
+        # Only wait for company when the last commit actually grouped several writers;
+        # writers arriving while a commit is running still pile up behind _commit_lock.
+        if self.window and self._last_batch_size > 1:
+            time.sleep(self.window)
+        with self._commit_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._leader_active = False
+            self._last_batch_size = len(batch)
+            try:
+                self._commit(batch)
+            except Exception as e:
+                for ticket in batch:
+                    ticket.error = ticket.error or e
+            finally:
+                for ticket in batch:
+                    ticket.done.set()
+
+    def _new_id(self, *pending_ids: Dict[str, dict]) -> str:
+        while True:
+            id_ = self.id_prefix + uuid.uuid4().hex
+            if id_ not in self.by_id and not any(id_ in ids for ids in pending_ids):
+                return id_
+
+    def _commit(self, batch: List[_Ticket]):
+        new_records: Dict[str, List[dict]] = defaultdict(list)
+        new_ids: Dict[str, dict] = {}
+        new_keys: Dict[Tuple[str, str], Tuple[dict, str]] = {}
+        for ticket in batch:
+            # Stage each ticket separately so one failing ticket cannot fail the others
+            results = []
+            ticket_records: Dict[str, List[dict]] = defaultdict(list)
+            ticket_ids: Dict[str, dict] = {}
+            ticket_keys: Dict[Tuple[str, str], Tuple[dict, str]] = {}
+            try:
+                for collection, data, key, fingerprint in ticket.items:
+                    existing = None
+                    if key is not None:
+                        existing = self.by_key.get((collection, key)) or new_keys.get((collection, key)) or ticket_keys.get((collection, key))
+                    if existing is not None:
+                        record, seen_fingerprint = existing
+                        if seen_fingerprint != fingerprint:
+                            raise IdempotencyConflict(f"'{IDEMPOTENCY_FIELD}' {key!r} was already used with a different {collection} payload")
+                        results.append((record, False))
+                        continue
+                    record = {**data, "id": self._new_id(new_ids, ticket_ids)}
+                    ticket_ids[record["id"]] = record
+                    if key is not None:
+                        ticket_keys[(collection, key)] = (record, fingerprint)
+                    ticket_records[collection].append(record)
+                    results.append((record, True))
+            except Exception as e:
+                ticket.error = e
+                continue
+            for collection, records in ticket_records.items():
+                new_records[collection].extend(records)
+            new_ids.update(ticket_ids)
+            new_keys.update(ticket_keys)
+            ticket.results = results
+        if not new_records:
+            return
+        for collection, records in new_records.items():
+            self.collections[collection].extend(records)
+        self.by_id.update(new_ids)
+        self.by_key.update(new_keys)
+        while len(self.by_key) > self.max_keys:
+            self.by_key.popitem(last=False)
+        self.commits += 1
+        if any(self.listeners[collection] for collection in new_records):
+            self._notify(dict(new_records))
@@ -7,7 +7,10 @@ from mock_data import clients, orders, payments, courses, classes, attendance
 from datetime import datetime, timedelta
 from typing import Dict, List
 import json
-from tools import external_api
+from tools import external_api, bulk_create
+from group_commit import IdempotencyConflict
+from fastapi.responses import JSONResponse
+from fastapi.concurrency import run_in_threadpool
 import httpx
 import datetime
 
@@ -273,7 +276,32 @@ async def external_demo_endpoint(request: Request):
     data_obj = data.get("data", {})
     if not type_:
         return {"success": False, "error": "Missing 'type' in request body."}
-    # Call the mock ExternalAPITool
+    # Call the mock ExternalAPITool (off the event loop, writes wait for a group commit)
     import json as _json
-    result = external_api(_json.dumps({"type": type_, "data": data_obj}))
+    result = await run_in_threadpool(external_api, _json.dumps({"type": type_, "data": data_obj}))
     return {"success": True, "result": result}
+
+@app.post("/api/external-demo/bulk")
+async def external_demo_bulk_endpoint(request: Request):
+    """
+    Body: {"clients": [...], "orders": [...], "idempotencyKey": optional}.
+    The Idempotency-Key header is used when the body has no key.
+    This is a demo store: created records stay in memory for the life of the process,
+    and only the newest IDEMPOTENCY_KEY_LIMIT keys are remembered for replays.
+    Invalid records are listed under 'errors' and not written; reusing a key with a
+    different payload returns 409 and writes nothing from the request.
+    """
+    data = await request.json()
+    if not isinstance(data, dict):
+        return {"success": False, "error": "Request body must be a JSON object."}
+    clients_in = data.get("clients")
+    orders_in = data.get("orders")
+    if not clients_in and not orders_in:
+        return {"success": False, "error": "Provide 'clients' and/or 'orders' arrays."}
+    idempotency_key = data.get("idempotencyKey") or request.headers.get("Idempotency-Key")
+    try:
+        return await run_in_threadpool(bulk_create, clients_in, orders_in, idempotency_key)
+    except IdempotencyConflict as e:
+        return JSONResponse(status_code=409, content={"success": False, "error": str(e)})
+    except Exception as e:
+        return {"success": False, "error": str(e)}
@@ -0,0 +1,131 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+# Tools that only read data and can safely run side by side in one step.
+# Anything else (e.g. ExternalAPITool, which creates records) runs on its own; actions
+# always run in the order the LLM listed them, so a read listed after a write sees it.
+CONCURRENT_TOOLS = {"MongoDBTool", "RAGTool"}
+
+FORMAT_INSTRUCTIONS = """Use the following format:
+
+Question: the input question you must answer
+Thought: you should always think about what to do
+Action: the action to take, should be one of [{tool_names}]
+Action Input: the input to the action
+... (you may list several Action/Action Input pairs in one step when they do not depend on each other; they run in the listed order, consecutive reads together, and every result is returned together)
+Observation [tool name]: the result of each action
+... (this Thought/Action/Action Input/Observation can repeat N times)
+Thought: I now know the final answer
+Final Answer: the final answer to the original input question"""
+
+SUFFIX = """Begin!
+
+Question: {input}
+Thought:{agent_scratchpad}"""
+
+ITERATION_LIMIT_MESSAGE = "Agent stopped due to iteration limit or time limit."
+
+_ACTION_RE = re.compile(
+    r"Action\s*\d*\s*:[ \t]*(.*?)[ \t]*\n\s*Action\s*\d*\s*Input\s*\d*\s*:[ \t]*(.*?)(?=\n\s*Action\s*\d*\s*:|\n\s*Thought\s*:|\n\s*Final Answer\s*:|\Z)",
+    re.DOTALL,
+)
+_FINAL_RE = re.compile(r"Final Answer\s*:(.*)", re.DOTALL)
+
+
+def parse_actions(text: str) -> Tuple[List[Tuple[str, str]], Optional[str]]:
+    """
+    Parse an LLM response into (actions, final_answer).
+    actions is a list of (tool_name, tool_input) pairs; final_answer is only set
+    when the response contains no actions.
+    """
+    actions = [(name.strip(), tool_input.strip().strip('"')) for name, tool_input in _ACTION_RE.findall(text)]
+    if actions:
+        return actions, None
+    final = _FINAL_RE.search(text)
+    if final:
+        return [], final.group(1).strip()
+    return [], None
+
+
+class ParallelToolAgent:
+    """
+    ReAct-style agent that lets the LLM request several tool calls in a single step.
+    Independent read-only calls (MongoDBTool, RAGTool) run concurrently and all
+    observations are fed back to the LLM in one turn, saving a round trip per extra call.
+    Exposes run({"input": ...}) like the AgentExecutor returned by initialize_agent.
+    """
+
+    def __init__(self, llm, tools, prefix: str = "", max_iterations: int = 15, max_workers: int = 4, verbose: bool = False):
+        self.llm = llm
+        self.tools: Dict[str, object] = {t.name: t for t in tools}
+        self.max_iterations = max_iterations
+        self.max_workers = max_workers
+        self.verbose = verbose
+        tool_strings = "\n".join(f"{t.name}: {t.description}" for t in tools)
+        # The prefixes contain literal JSON examples, so only the suffix is templated.
+        self.header = "\n\n".join([
+            prefix,
+            tool_strings,
+            FORMAT_INSTRUCTIONS.format(tool_names=", ".join(self.tools)),
+        ])
+
+    def _call_tool(self, name: str, tool_input: str) -> str:
+        tool = self.tools.get(name)
+        if tool is None:
+            return f"{name} is not a valid tool, try one of [{', '.join(self.tools)}]."
+        try:
+            return str(tool.run(tool_input))
+        except Exception as e:
+            return json.dumps({"success": False, "error": str(e)})
+
+    def _run_batch(self, batch: List[Tuple[str, str]]) -> List[str]:
+        if len(batch) == 1 or self.max_workers <= 1:
+            return [self._call_tool(*action) for action in batch]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batch))) as pool:
+            return list(pool.map(lambda action: self._call_tool(*action), batch))
+
+    def _execute(self, actions: List[Tuple[str, str]]) -> List[str]:
+        # Split at every non-concurrent tool so reads never jump ahead of a listed write
+        observations: List[str] = []
+        batch: List[Tuple[str, str]] = []
+        for action in actions:
+            if action[0] in CONCURRENT_TOOLS:
+                batch.append(action)
+                continue
+            if batch:
+                observations.extend(self._run_batch(batch))
+                batch = []
+            observations.append(self._call_tool(*action))
+        if batch:
+            observations.extend(self._run_batch(batch))
+        return observations
+
+    def _predict(self, prompt: str) -> str:
+        response = self.llm.invoke(prompt, stop=["\nObservation"])
+        return getattr(response, "content", response)
+
+    def run(self, inputs) -> str:
+        question = inputs.get("input") if isinstance(inputs, dict) else inputs
+        if not isinstance(question, str):
+            question = json.dumps(question)
+        scratchpad = ""
+        for _ in range(self.max_iterations):
+            prompt = self.header + "\n\n" + SUFFIX.replace("{input}", question).replace("{agent_scratchpad}", scratchpad)
+            text = self._predict(prompt)
+            if self.verbose:
+                print(text)
+            actions, final_answer = parse_actions(text)
+            if final_answer is not None:
+                return final_answer
+            scratchpad += text
+            if not actions:
+                scratchpad += "\nObservation: Invalid Format: Missing 'Action:' or 'Final Answer:' after 'Thought:'\nThought:"
+                continue
+            for (name, _), observation in zip(actions, self._execute(actions)):
+                if self.verbose:
+                    print(f"Observation [{name}]: {observation}")
+                scratchpad += f"\nObservation [{name}]: {observation}"
+            scratchpad += "\nThought:"
+        return ITERATION_LIMIT_MESSAGE
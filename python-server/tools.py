@@ -1,7 +1,9 @@
 from langchain.tools import tool
 import mock_data
 import json
+import os
 import re
+from group_commit import GroupCommitStore, IDEMPOTENCY_FIELD
 from datetime import datetime, timedelta
 try:
     from sentence_transformers import SentenceTransformer, util
@@ -144,16 +146,129 @@ def mongo_query(input: str = None, **kwargs):
     except Exception as e:
         return json.dumps({"success": False, "error": str(e)})
 
+# Writes from ExternalAPITool and /api/external-demo go through one group-commit store,
+# so the agent tools and /api/metrics see new clients/orders immediately. Records are
+# checked by clean_external_record first, since those readers assume the field types.
+external_store = GroupCommitStore(
+    {"clients": mock_data.clients, "orders": mock_data.orders},
+    window=float(os.getenv("GROUP_COMMIT_WINDOW_MS", "0")) / 1000,
+    max_keys=int(os.getenv("IDEMPOTENCY_KEY_LIMIT", "100000")),
+)
+EXTERNAL_TYPES = {
+    "client": "clients", "clients": "clients", "customer": "clients", "lead": "clients",
+    "enquiry": "clients", "enquiries": "clients", "inquiry": "clients", "ticket": "clients",
+    "client_enquiry": "clients", "enquiry_ticket": "clients",
+    "order": "orders", "orders": "orders", "purchase": "orders", "booking": "orders", "enrollment": "orders",
+}
+
+def external_collection(type_):
+    """Map an ExternalAPITool 'type' to a collection, falling back to keyword matching."""
+    name = re.sub(r"[\s-]+", "_", str(type_ or "").strip().lower())
+    if name in EXTERNAL_TYPES:
+        return EXTERNAL_TYPES[name]
+    if "order" in name:
+        return "orders"
+    if any(word in name for word in ("client", "enquir", "inquir", "ticket")):
+        return "clients"
+    return None
+
+def _check_date(record, field):
+    value = record.get(field)
+    if value is None:
+        return
+    if not isinstance(value, str):
+        raise ValueError(f"'{field}' must be a YYYY-MM-DD string")
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ValueError(f"'{field}' must be a YYYY-MM-DD string")
+
+def clean_external_record(record):
+    """
+    Validate and coerce the fields that mongo_query and /api/metrics compute on.
+    Returns a cleaned copy or raises ValueError.
+    """
+    record = dict(record)
+    if "amount" in record:
+        amount = record["amount"]
+        if isinstance(amount, str):
+            try:
+                amount = float(amount.strip())
+            except ValueError:
+                raise ValueError("'amount' must be a number")
+            if amount.is_integer():
+                amount = int(amount)
+        if isinstance(amount, bool) or not isinstance(amount, (int, float)) or amount != amount or amount in (float("inf"), float("-inf")):
+            raise ValueError("'amount' must be a number")
+        record["amount"] = amount
+    _check_date(record, "created_at")
+    _check_date(record, "birthday")
+    for field in ("status", "service"):
+        if record.get(field) is not None and not isinstance(record[field], str):
+            raise ValueError(f"'{field}' must be a string")
+    return record
+
+def bulk_create(clients=None, orders=None, idempotency_key=None):
+    """
+    Create clients and orders in a single group commit.
+    Items may carry their own 'idempotencyKey'; otherwise a request-level key is
+    expanded to '<key>:<collection>:<index>' so retrying the whole request is safe.
+    Invalid records are skipped and listed under 'errors'; the rest are written.
+    Raises IdempotencyConflict if a key is reused with a different payload.
+    """
+    items = []
+    errors = []
+    for collection, records in (("clients", clients or []), ("orders", orders or [])):
+        if not isinstance(records, list):
+            return {"success": False, "error": f"'{collection}' must be a list"}
+        for i, record in enumerate(records):
+            try:
+                if not isinstance(record, dict):
+                    raise ValueError("record must be a dictionary")
+                record = clean_external_record(record)
+            except ValueError as e:
+                errors.append({"collection": collection, "index": i, "error": str(e)})
+                continue
+            if idempotency_key and IDEMPOTENCY_FIELD not in record:
+                record = {**record, IDEMPOTENCY_FIELD: f"{idempotency_key}:{collection}:{i}"}
+            items.append((collection, record))
+    results = external_store.submit(items) if items else []
+    response = {"success": True, "clients": [], "orders": [], "created": 0, "replayed": 0, "rejected": len(errors), "errors": errors}
+    for (collection, _), (record, created) in zip(items, results):
+        response[collection].append(record)
+        response["created" if created else "replayed"] += 1
+    return response
+
 @tool("ExternalAPITool")
 def external_api(data: str):
-    """Create new clients or orders via the external API."""
+    """
+    Create new clients or orders via the external API.
+    Input: JSON string, either {"type": ..., "data": {...} or [...]}
+    or a bulk request {"clients": [...], "orders": [...]}.
+    Accepted types: client, customer, lead, enquiry, inquiry, ticket, client_enquiry
+    (create a client) and order, purchase, booking, enrollment (create an order).
+    'amount' must be a number; 'created_at' and 'birthday' must be YYYY-MM-DD.
+    Add an 'idempotencyKey' to a record to make retries safe; reusing it with
+    different data is rejected.
+    """
     try:
         params = json.loads(data)
+        if "clients" in params or "orders" in params:
+            return json.dumps(bulk_create(params.get("clients"), params.get("orders"), params.get(IDEMPOTENCY_FIELD)))
         type_ = params.get("type")
         data_obj = params.get("data", {})
+        collection = external_collection(type_)
+        if not collection:
+            return json.dumps({"success": False, "error": f"Unsupported type '{type_}'. Use one of: {', '.join(EXTERNAL_TYPES)}"})
+        if isinstance(data_obj, list):
+            result = bulk_create(**{collection: data_obj})
+            if not result["success"]:
+                return json.dumps(result)
+            return json.dumps({"success": True, "created": result[collection], "errors": result["errors"]})
         if not isinstance(data_obj, dict):
             return json.dumps({"success": False, "error": "'data' must be a dictionary"})
-        return json.dumps({"success": True, "created": {**data_obj, "id": "mock_" + str(hash(str(data_obj)))}})
+        [(record, _)] = external_store.submit([(collection, clean_external_record(data_obj))])
+        return json.dumps({"success": True, "created": record})
     except Exception as e:
         return json.dumps({"success": False, "error": str(e)})
 
@@ -179,6 +294,21 @@ else:
     import torch
     corpus_embeddings = torch.empty((0, 384))  # 384 is the embedding size for MiniLM
 
+def _index_client_notes(new_clients):
+    """Extend the RAG corpus with notes from newly created clients, encoding the whole batch at once."""
+    global corpus_embeddings
+    notes = [(c["notes"], {"type": "client", "name": c.get("name", "")}) for c in new_clients if c.get("notes")]
+    if not notes:
+        return
+    new_embeddings = model.encode([text for text, _ in notes], convert_to_tensor=True) if model is not None else None
+    corpus.extend(text for text, _ in notes)
+    corpus_meta.extend(meta for _, meta in notes)
+    if new_embeddings is not None:
+        import torch
+        corpus_embeddings = torch.cat([corpus_embeddings.to(new_embeddings.device), new_embeddings])
+
+external_store.add_listener("clients", _index_client_notes)
+
 @tool("RAGTool")
 def rag_tool(query: str):
     """Retrieve relevant context from courses, classes, and client notes for a given query."""